@@ -6,142 +6,236 @@
 
 import os
 import logging
-import json
-import time
+import orjson
 import tqdm
 import pickle
+import asyncio
+import threading
+import aiohttp
+import fitz
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from yarl import URL
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from webdriver_manager.chrome import ChromeDriverManager
 from utils import init_driver, clean_text
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 
+# 去除引号，以及去除冒号和引号的转换表
+_QUOTE_TRANS = str.maketrans('', '', '\'"')
+_KEY_TRANS = str.maketrans('', '', ':\'"')
+
+# 在页面内一次性执行所有选择器查询并返回JSON，避免逐个元素的WebDriver往返
+EXTRACT_DATASET_INFO_JS = """
+const selectors = arguments[0];
+const first = (selector) => document.querySelector(selector);
+const text = (node) => node ? node.innerText : null;
+const dataInfoDiv = first(selectors.data_info_div);
+const section = first(selectors.related_section);
+return JSON.stringify({
+    download_count: text(first(selectors.download_count)),
+    community: text(first(selectors.community)),
+    like: text(first(selectors.like)),
+    tags: Array.from(document.querySelectorAll(selectors.tags_info))
+        .filter(div => div.querySelector('span'))
+        .map(div => ({key: div.querySelector('span').innerText, value: div.innerText})),
+    data_info: dataInfoDiv ? Array.from(dataInfoDiv.querySelectorAll('a'))
+        .map(a => Array.from(a.querySelectorAll('div')).map(div => div.innerText))
+        .filter(divs => divs.length === 2) : null,
+    panel_info: text(first(selectors.dataset_panel)),
+    section_html: section ? section.outerHTML : null
+});
+"""
+
 
 class HuggingfaceCrawler:
     """
     爬取Huggingface数据集信息，首先需要爬取数据集链接，然后再爬取数据集信息，如果已经爬取了数据集链接，则直接爬取数据集信息
     数据集链接文件：hugging_face_organization_datasets_links.json
     """
+    # =========================== 数据集页面元素的CSS选择器，静态HTML解析与浏览器查询共用 ================================
+    # 如果需要填写表单，则填写表单的元素
+    NEED_FINISH_FORM_SEL = 'body > div > main > div:nth-of-type(2) > section:nth-of-type(1) > div:nth-of-type(1) > div > form'
+    # 表单中需要填写的各项
+    FORM_ITEMS_SEL = NEED_FINISH_FORM_SEL + ' > label'
+    # 如果获取数据集详情需要填写表单并点击按钮
+    FINISH_FORM_BUTTON_SEL = NEED_FINISH_FORM_SEL + ' > div > button'
+    # tags信息
+    TAGS_INFO_SEL = 'body > div > main > div:nth-of-type(1) > header > div > div:nth-of-type(1) > div'
+    # 右侧面板信息
+    DATA_INFO_DIV_SEL = 'div[class="flex flex-col flex-wrap xl:flex-row"]'
+    # 下载量
+    DOWNLOAD_SEL = 'body > div > main > div:nth-of-type(2) > section:nth-of-type(2) > dl > dd'
+    # 社区活跃
+    COMMUNITY_SEL = 'body > div > main > div:nth-of-type(1) > header > div > div:nth-of-type(2) > div > a:last-of-type'
+    # 点赞数
+    LIKE_SEL = 'body > div > main > div:nth-of-type(1) > header > div > h1 > div:nth-of-type(3) > button:nth-of-type(2)'
+    # 数据集面板
+    DATASET_PANEL_SEL = "div[class='2xl:pr-6']"
+    # 右侧 Collection 与相关 Model 信息
+    RELATED_SECTION_SEL = 'body > div > main > div:nth-of-type(2) > section:nth-of-type(2)'
+    # 排序方法与数据集API排序字段的映射，API不支持按数据行数排序
+    API_SORT_MAP = {
+        'downloads': 'downloads',
+        'updated': 'lastModified',
+        'created': 'createdAt',
+        'alphabetical': 'id',
+        'likes': 'likes',
+    }
 
     def __init__(self, headless=True,
                  organization_links_file_path='organization_links/hugging_faceorganization_links.json',
                  sort_method='downloads', save_dir='result/huggingface',
                  organization_datasets_links_save_file='hugging_face_organization_datasets_links.json',
-                 logging_cookie_file_path='./huggingface_cookies.pkl'):
+                 logging_cookie_file_path='./huggingface_cookies.pkl', max_concurrency=8, max_workers=4,
+                 max_paper_concurrency=2):
         """
         初始化
         :param headless:                        是否启用无头模式
         :param organization_links_file_path:    机构链接文件路径
-        :param sort_method:                     排序方法-[updated, created, alphabetical, likes, downloads, rowsMost, rowsLeast]
+        :param sort_method:                     排序方法-[updated, created, alphabetical, likes, downloads]
         :param save_dir:                        保存目录
         :param organization_datasets_links_save_file:  机构数据集链接保存文件
         :param logging_cookie_file_path:        登录cookie文件路径
+        :param max_concurrency:                 并发请求数据集页面的最大数量
+        :param max_workers:                     并行处理需要填写表单页面的浏览器数量
+        :param max_paper_concurrency:           同时下载arxiv论文的最大数量，避免触发arxiv限流
         """
-        self.driver = init_driver(headless)
+        self.headless = headless
         self.organization_links_file_path = organization_links_file_path
         self.sort_method = sort_method
         self.save_dir = save_dir
         self.organization_datasets_links_save_file = organization_datasets_links_save_file
         self.logging_cookie_file_path = logging_cookie_file_path
-        # 初始化logger，初始化相关元素的Xpath
+        self.max_concurrency = max_concurrency
+        self.max_workers = max_workers
+        self.max_paper_concurrency = max_paper_concurrency
+        # 静态页面与表单页面共用，限制同时访问arxiv的线程数
+        self._paper_semaphore = threading.BoundedSemaphore(max_paper_concurrency)
+        # 每个工作线程持有自己的浏览器驱动
+        self._thread_local = threading.local()
+        self._worker_drivers = []
+        self._worker_drivers_lock = threading.Lock()
+        self._driver_path = None
+        # 后台写入截图文件，使写盘与下一个页面的加载重叠
+        self.io_pool = ThreadPoolExecutor(max_workers=2)
+        # 复用连接的HTTP会话，用于请求数据集API、下载arxiv论文等
+        self.http = requests.Session()
+        self.http.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=32,
+                                                max_retries=Retry(total=3, backoff_factor=0.3,
+                                                                  status_forcelist=(429, 500, 502, 503, 504))))
+        # 初始化logger
         self._init_logger(log_level=logging.INFO)
-        self._init_relevant_element_xpath()
         # 创建保存截图的文件夹
         if not os.path.exists(f'{self.save_dir}/hugging_face_dataset_info_screenshots'):
-            os.makedirs('result/huggingface/hugging_face_dataset_info_screenshots')
+            os.makedirs(f'{self.save_dir}/hugging_face_dataset_info_screenshots')
         self.screen_shot_save_path = f'{self.save_dir}/hugging_face_dataset_info_screenshots'
-
-    def _init_relevant_element_xpath(self) -> None:
+        # 每爬取完一个数据集就追加写入一行结果，重新运行时跳过结果文件中已有的数据集
+        self.results_file_path = f'{self.save_dir}/dataset_details.jsonl'
+        self.out_fp = open(self.results_file_path, 'ab')
+        # 上次运行中断时最后一行可能不完整，补上换行避免与新记录粘连
+        if self.out_fp.tell() > 0:
+            with open(self.results_file_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self.out_fp.write(b'\n')
+
+    def close(self) -> None:
         """
-        初始化相关元素的Xpath
+        等待截图写入完成，关闭HTTP会话及结果文件
         :return:
         """
-        # =========================== _crawl_dataset_links相关的 ================================
-        # expand all按钮
-        self.expand_all_button_xpath = '//*[@id="datasets"]/div/div[2]/div/button'
-        # 每一个数据集的div
-        self.dataset_item_xpath = '//*[@id="datasets"]/div/div/article'
-        # =========================== _crawl_dataset_info相关的 ================================
-        # 如果需要填写表单，则填写表单的元素
-        self.need_finish_form_xpath = '/html/body/div/main/div[2]/section[1]/div[1]/div/form'
-        # 如果需要填写表单，则填写表单的元素
-        self.form_items_xpath = '/html/body/div/main/div[2]/section[1]/div[1]/div/form/label'
-        # 如果获取数据集详情需要填写表单并点击按钮
-        self.finish_form_button_xpath = '/html/body/div/main/div[2]/section[1]/div[1]/div/form/div/button'
-        # tags信息
-        self.tags_info_xpath = '/html/body/div/main/div[1]/header/div/div[1]/div'
-        # 右侧面板信息
-        self.data_info_div_xpath = '//div[@class="flex flex-col flex-wrap xl:flex-row"]'
-        # 下载量
-        self.download_count_xpath = '/html/body/div/main/div[2]/section[2]/dl/dd'
-        # 社区活跃
-        self.community_xpath = '/html/body/div/main/div[1]/header/div/div[2]/div/a[last()]'
-        # 点赞数
-        self.like_xpath = '/html/body/div/main/div[1]/header/div/h1/div[3]/button[2]'
+        self.io_pool.shutdown(wait=True)
+        self.http.close()
+        self.out_fp.close()
+
+    def load_results(self, dataset_links=None) -> dict:
+        """
+        逐行读取结果文件，重新组装为{组织名：{数据集名：{详细信息}}}，同一数据集以最后一次写入为准
+        :param dataset_links:   只保留这些链接对应的数据集，为None时保留全部
+        :return:                {组织名：{数据集名：{详细信息}}}
+        """
+        dataset_links = set(dataset_links) if dataset_links is not None else None
+        dataset_details = {}
+        for record in self._iter_results():
+            if dataset_links is not None and record.get('link') not in dataset_links:
+                continue
+            organization = record.pop('org')
+            dataset_name = record.pop('name')
+            dataset_details.setdefault(organization, {})[dataset_name] = record
+        return dataset_details
+
+    def _iter_results(self):
+        """
+        逐行读取结果文件中的每条记录，跳过空行及中断写入导致的不完整行
+        :return:    记录生成器
+        """
+        if not os.path.exists(self.results_file_path):
+            return
+        with open(self.results_file_path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    logging.warning(f"Skip broken line in {self.results_file_path}")
 
     def crawl_dataset_links(self) -> None:
         """
-        爬取数据集链接
+        通过Huggingface数据集API获取每个机构发布的数据集链接
         :return:
         """
+        # 在写入链接文件之前校验排序方法，避免生成空的链接文件
+        if self.sort_method not in self.API_SORT_MAP:
+            raise ValueError(f"Invalid sort_method, the datasets API supports: {list(self.API_SORT_MAP)}.")
         # 读取机构链接
-        with open(self.organization_links_file_path, 'r', encoding='utf-8') as f:
-            crawl_targets = json.load(f)
+        with open(self.organization_links_file_path, 'rb') as f:
+            crawl_targets = orjson.loads(f.read())
 
         organization_datasets_links = {}
         # 遍历所有机构链接，获取机构发布数据集链接
         for index, target in crawl_targets.items():
-            time.sleep(1)
             try:
                 if target is None or target == '':
                     continue
                 logging.info(f"Scrawling {index}: {target}")
-                target = self._get_related_links(target)
-                self.driver.get(target)
-
-                # 如果存在按钮，则点击——expand all
-                time.sleep(1)
-                try:
-                    self.driver.find_element(By.XPATH, self.expand_all_button_xpath).click()
-                except:
-                    logging.info(f"Don't have expand all button.")
-
-                # 获取所有数据集相关信息
-                articles = self.driver.find_elements(By.XPATH, self.dataset_item_xpath)
-                logging.info(f"current organization have datasets: {len(articles)}")
-                for article in articles:
-                    a_tag = article.find_element(By.TAG_NAME, 'a')
-                    dataset_link = a_tag.get_attribute('href')
-                    if index not in organization_datasets_links:
-                        organization_datasets_links[index] = []
-                    organization_datasets_links[index].append(dataset_link)
-                    logging.info(f"Got dataset link: {dataset_link}")
+                url = self._get_related_links(target)
+                dataset_links = []
+                # API结果分页返回，通过响应头中的next链接获取下一页
+                while url:
+                    response = self.http.get(url, timeout=15)
+                    response.raise_for_status()
+                    dataset_links.extend(f"https://huggingface.co/datasets/{dataset['id']}"
+                                         for dataset in orjson.loads(response.content))
+                    url = response.links.get('next', {}).get('url')
+                logging.info(f"current organization have datasets: {len(dataset_links)}")
+                if dataset_links:
+                    organization_datasets_links[index] = dataset_links
             except Exception as e:
                 logging.error(f"Error: {e}, when crawling {index}: {target}")
 
         # 保存数据集链接
-        with open(f'{self.save_dir}/{self.organization_datasets_links_save_file}', 'w', encoding='utf-8') as f:
-            json.dump(organization_datasets_links, f, indent=4)
+        with open(f'{self.save_dir}/{self.organization_datasets_links_save_file}', 'wb') as f:
+            f.write(orjson.dumps(organization_datasets_links, option=orjson.OPT_INDENT_2))
 
     def _get_related_links(self, current_link=None) -> str:
         """
-        获取相关数据集链接
-        :param current_link:    当前链接
+        获取机构数据集列表的API链接
+        :param current_link:    机构链接，如https://huggingface.co/OpenGVLab
         """
         if current_link is None:
             raise ValueError("current_link cannot be None.")
-        # 排序方法映射
-        sort_map = {
-            'downloads': 'downloads',
-            'updated': 'modified',
-            'created': 'created',
-            'alphabetical': 'alphabetical',
-            'likes': 'likes',
-            'rowsMost': 'most_rows',
-            'rowsLeast': 'least_rows'
-        }
-        if self.sort_method not in sort_map:
-            raise ValueError("Invalid sort_method.")
-
-        target_url = f"{current_link}?sort_datasets={sort_map[self.sort_method]}#datasets"
+        organization = current_link.rstrip('/').rsplit('/', 1)[-1]
+        target_url = (f"https://huggingface.co/api/datasets?author={organization}"
+                      f"&sort={self.API_SORT_MAP[self.sort_method]}&limit=1000")
+        # 除按名称排序外均为降序
+        if self.sort_method != 'alphabetical':
+            target_url += '&direction=-1'
         return target_url
 
     def _init_logger(self, log_level: int = logging.INFO) -> None:
@@ -167,193 +261,425 @@ class HuggingfaceCrawler:
             self.crawl_dataset_links()
 
         # 读取数据集链接
-        with open(f'{self.save_dir}/{self.organization_datasets_links_save_file}', 'r', encoding='utf-8') as f:
-            organization_datasets_links = json.load(f)
+        with open(f'{self.save_dir}/{self.organization_datasets_links_save_file}', 'rb') as f:
+            organization_datasets_links = orjson.loads(f.read())
 
-        # 获取所有数据集的链接
-        all_dataset_links = []
-        for organization, links in organization_datasets_links.items():
-            all_dataset_links.extend(links)
+        # 获取所有数据集的链接，多个机构可能列出同一个数据集，保持顺序去重
+        all_dataset_links = list(dict.fromkeys(
+            link for links in organization_datasets_links.values() for link in links))
 
-        # 获取所有数据集的详细信息
-        dataset_details, exception_links = self._get_all_link_data(all_dataset_links)
-        return dataset_details, exception_links
+        # 获取所有数据集的详细信息，结果逐条写入结果文件，最后再统一读取
+        exception_links = self._get_all_link_data(all_dataset_links)
+        return self.load_results(all_dataset_links), exception_links
 
     def _get_all_link_data(self, all_dataset_links):
         """
         获取所有数据集的详细信息
-        最终结果：{组织名：{数据集名：{详细信息}}}
+        数据集页面的元数据在服务端渲染的HTML中即可获取，因此先用aiohttp并发请求并解析；
+        只有需要填写表单的页面才交给Selenium处理
+        每个数据集的结果以{"org": 组织名, "name": 数据集名, ...详细信息}的形式逐行追加到结果文件中
         :param all_dataset_links:   所有数据集的链接
-        :return:                    {组织名：{数据集名：{详细信息}}}
+        :return:                    爬取失败的链接
         """
-        dataset_details = {}
         exception_links = []
+        need_form_links = []
 
-        # 首先登录
-        self.driver.get('https://huggingface.co/login')
+        # 结果文件中已有的数据集在之前的运行中已爬取完成，直接跳过
+        done_links = {record.get('link') for record in self._iter_results()}
+        pending_links = [link for link in all_dataset_links if link not in done_links]
+        logging.info(f"Cached datasets: {len(all_dataset_links) - len(pending_links)}, "
+                     f"pending datasets: {len(pending_links)}")
+
+        # 并发获取并解析所有数据集页面，每完成一个数据集立即写入结果文件
+        asyncio.run(self._crawl_static_pages(pending_links, exception_links, need_form_links))
+
+        if not need_form_links:
+            return exception_links
+
+        # 使用多个浏览器并行处理需要填写表单的页面，chromedriver在主线程中只下载一次，避免多个线程同时下载
+        if self._driver_path is None:
+            self._driver_path = ChromeDriverManager().install()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self._scrape_with_worker_driver, link): link for link in need_form_links}
+                for future in tqdm.tqdm(as_completed(futures), total=len(futures)):
+                    organization, dataset_name, details, error = future.result()
+                    if error is not None:
+                        logging.info(f"Error: {error}, when crawling {futures[future]}")
+                        exception_links.append(futures[future])
+                        continue
+                    self._save_record(organization, dataset_name, details)
+        finally:
+            self._quit_worker_drivers()
+        return exception_links
+
+    def _save_record(self, organization, dataset_name, record):
+        """
+        保存单个数据集的详细信息：追加写入结果文件
+        :param organization:        组织名称
+        :param dataset_name:        数据集名称
+        :param record:              当前数据集详细信息
+        :return:                    None
+        """
+        self.out_fp.write(orjson.dumps({'org': organization, 'name': dataset_name, **record},
+                                       option=orjson.OPT_APPEND_NEWLINE))
+        self.out_fp.flush()
+
+    async def _crawl_static_pages(self, all_dataset_links, exception_links, need_form_links):
+        """
+        使用同一个aiohttp会话并发获取所有数据集页面，每完成一个数据集立即保存
+        :param all_dataset_links:   所有数据集的链接
+        :param exception_links:     爬取失败的链接，存储对象
+        :param need_form_links:     需要填写表单的链接，存储对象
+        :return:                    None
+        """
         with open(self.logging_cookie_file_path, "rb") as file:
             cookies = pickle.load(file)
-            for cookie in cookies:
-                self.driver.add_cookie(cookie)
-        self.driver.refresh()
-        time.sleep(1)
-
-        # 遍历所有数据集链接，爬取数据集详细信息
-        for link in tqdm.tqdm(all_dataset_links):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=30)
+        # aiohttp从环境变量中只读取http/https代理，utils中设置的ALL_PROXY需要显式传入
+        proxy = os.environ.get('ALL_PROXY') or os.environ.get('all_proxy')
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, trust_env=True) as session:
+            session.cookie_jar.update_cookies({cookie['name']: cookie['value'] for cookie in cookies},
+                                              response_url=URL('https://huggingface.co/'))
+            with ThreadPoolExecutor(max_workers=self.max_paper_concurrency) as paper_pool:
+                tasks = [asyncio.create_task(self._fetch_one(session, link, semaphore, paper_pool, proxy))
+                         for link in all_dataset_links]
+                for task in tqdm.tqdm(asyncio.as_completed(tasks), total=len(tasks)):
+                    link, record, error = await task
+                    if error is not None:
+                        logging.info(f"Error: {error}, when crawling {link}")
+                        exception_links.append(link)
+                        continue
+                    # 需要填写表单的页面，稍后使用Selenium处理
+                    if record is None:
+                        need_form_links.append(link)
+                        continue
+                    organization, dataset_name = link.rsplit('/', 2)[-2:]
+                    self._save_record(organization, dataset_name, record)
+
+    async def _fetch_one(self, session, link, semaphore, paper_pool, proxy=None):
+        """
+        获取并解析单个数据集页面并对相关论文截图，解析与截图在线程中执行，不阻塞其他页面的下载
+        :param session:             aiohttp会话
+        :param link:                数据集链接
+        :param semaphore:           并发控制信号量
+        :param paper_pool:          下载并渲染论文的线程池
+        :param proxy:               代理地址，为None时直连
+        :return:                    (链接, 数据集详细信息, 异常)，需要填写表单时详细信息为None
+        """
+        async with semaphore:
             try:
-                self.driver.get(link)
-                time.sleep(1)
-
-                logging.info(f"Start crawling dataset: {link}")
-                # 如果查看数据集具体行数信息需要填写相关信息
-                if self.driver.find_elements(By.XPATH, self.need_finish_form_xpath):
-                    labels = self.driver.find_elements(By.XPATH, self.form_items_xpath)
-                    for label in labels:
-                        label.find_element(By.TAG_NAME, 'input').send_keys('asd')
-                    self.driver.find_element(By.XPATH, self.finish_form_button_xpath).click()
-                time.sleep(1)
-
-                organization = link.split("/")[-2]
-                dataset_name = link.split("/")[-1]
-                if organization not in dataset_details:
-                    dataset_details[organization] = {}
-                if dataset_name not in dataset_details[organization]:
-                    dataset_details[organization][dataset_name] = {}
-                # 对当前页面进行截图
-                self.driver.save_screenshot(f'{self.screen_shot_save_path}/{dataset_name}.png')
-                # 存储部分信息并获得arxiv_id
-                arxiv_id = self._extract_related_data(dataset_details, dataset_name, organization)
-
-                # 获取arxiv链接
-                if arxiv_id:
-                    arxiv_link = f'https://arxiv.org/pdf/{arxiv_id}'
-                    self.driver.get(arxiv_link)
-                    # TODO 这里需要等待页面加载完成，否则会出现截图不完整的情况，但是等待时间过长
-                    time.sleep(5)
-                    # 对arxiv页面进行截图
-                    self.driver.save_screenshot(
-                        f'{self.screen_shot_save_path}/{dataset_name}_pdf.png')
-
-                dataset_details[organization][dataset_name] = {}
-                dataset_details[organization][dataset_name]["link"] = link
-                dataset_details[organization][dataset_name][
-                    "paper_screenshot_save_path"] = f'{self.screen_shot_save_path}/{dataset_name}_pdf.png' if arxiv_id else ''
-                dataset_details[organization][dataset_name][
-                    "dataset_screenshot_save_path"] = f'{self.screen_shot_save_path}/{dataset_name}.png'
+                async with session.get(link, proxy=proxy) as response:
+                    response.raise_for_status()
+                    html = await response.text()
             except Exception as e:
-                logging.info(f"Error: {e}, when crawling {link}")
-                exception_links.append(link)
-        return dataset_details, exception_links
+                return link, None, e
+        try:
+            record = await asyncio.to_thread(self._parse_dataset_html, html)
+        except Exception as e:
+            return link, None, e
+        if record is None:
+            return link, None, None
+        arxiv_id = record.pop('arxiv_id')
+        record["link"] = link
+        record["paper_screenshot_save_path"] = await asyncio.get_running_loop().run_in_executor(
+            paper_pool, self._save_paper_screenshot, arxiv_id, link.rsplit('/', 1)[-1])
+        record["dataset_screenshot_save_path"] = ''
+        return link, record, None
+
+    def _parse_dataset_html(self, html):
+        """
+        从服务端渲染的数据集页面HTML中提取相关数据
+        :param html:                数据集页面HTML
+        :return:                    数据集详细信息（包含arxiv_id），如果需要填写表单则返回None
+        """
+        soup = BeautifulSoup(html, 'lxml')
+        if soup.select_one(self.NEED_FINISH_FORM_SEL):
+            return None
+
+        record = {}
+        # 获取下载量、community社交活跃量、like数量
+        download_count_last_month = clean_text(soup.select_one(self.DOWNLOAD_SEL).get_text())
+        community = soup.select_one(self.COMMUNITY_SEL).get_text()
+        like = soup.select_one(self.LIKE_SEL).get_text()
+        # 每个div下的span为key,div中除了span的其余标签部分的文本作为value，同时获取arxiv链接
+        dataset_tags_info_map = {}
+        arxiv_id = ''
+        for div in soup.select(self.TAGS_INFO_SEL):
+            # 与浏览器端脚本一致，跳过没有span的div
+            span = div.find('span')
+            if span is None:
+                continue
+            key = clean_text(span.get_text()).translate(_KEY_TRANS)
+            value = clean_text(div.get_text(' ').replace(key, '').split(':')[-1]).translate(_QUOTE_TRANS)
+            dataset_tags_info_map[key] = value
+            if key.lower() == 'arxiv':
+                # arxiv_id: 2107.06499 + 4 对于这种多篇文章的arxiv_id，只取第一篇
+                arxiv_id = clean_text(value.split(':')[-1]).split(' ')[0]
+        # 获取数据集一些相关的信息，每个a标签的第一个div作为key，第二个div作为value
+        data_info = {}
+        data_info_div = soup.select_one(self.DATA_INFO_DIV_SEL)
+        if data_info_div:
+            for a_tag in data_info_div.find_all('a'):
+                divs = a_tag.find_all('div')
+                if len(divs) == 2:
+                    data_info[clean_text(divs[0].get_text())] = clean_text(divs[1].get_text())
+        record["dataset_info"] = data_info
+        # 获取数据集面板信息
+        dataset_panel = soup.select_one(self.DATASET_PANEL_SEL)
+        if dataset_panel:
+            record['dataset_panel_info'] = dataset_panel.get_text('\n', strip=True).translate(_QUOTE_TRANS)
+        # 获取数据集右侧 Collection 与相关 Model 信息
+        section = soup.select_one(self.RELATED_SECTION_SEL)
+        record['related_models_collections'] = self._crawl_related_models_or_collections(str(section)) \
+            if section else {}
+        record['dataset_tags_info'] = dataset_tags_info_map
+        record["download_count_last_month"] = download_count_last_month
+        community = clean_text(community.replace('Community', ''))
+        like = clean_text(like.replace('Like', ''))
+        record['community'] = community or '0'
+        record['like'] = like or '0'
+        record['arxiv_id'] = arxiv_id
+        return record
+
+    def _get_worker_driver(self):
+        """
+        获取当前线程的浏览器驱动，首次使用时创建并登录
+        :return:    WebDriver
+        """
+        driver = getattr(self._thread_local, 'driver', None)
+        if driver is None:
+            driver = init_driver(self.headless, block_resources=True, driver_path=self._driver_path)
+            # 先登记再登录，登录失败时也能被_quit_worker_drivers关闭
+            with self._worker_drivers_lock:
+                self._worker_drivers.append(driver)
+            self._login(driver)
+            self._thread_local.driver = driver
+        return driver
+
+    def _scrape_with_worker_driver(self, link):
+        """
+        使用当前线程的浏览器驱动爬取数据集页面，驱动创建或登录失败时只影响当前链接
+        :param link:                数据集链接
+        :return:                    (组织名称, 数据集名称, 详细信息, 异常)
+        """
+        try:
+            driver = self._get_worker_driver()
+        except Exception as e:
+            organization, dataset_name = link.rsplit('/', 2)[-2:]
+            return organization, dataset_name, None, e
+        return self._scrape_one(driver, link)
 
-    def _extract_related_data(self, dataset_details, dataset_name, organization):
+    def _quit_worker_drivers(self):
         """
-        提取相关数据
-        :param dataset_details:         数据集详细信息，存储对象
-        :param dataset_name:            数据集名称
-        :param organization:            组织名称
-        :return:                        arxiv_id
+        关闭所有工作线程的浏览器驱动
+        :return:    None
+        """
+        with self._worker_drivers_lock:
+            for driver in self._worker_drivers:
+                try:
+                    driver.quit()
+                except Exception as e:
+                    logging.info(f"Quit driver failed: {e}")
+            self._worker_drivers = []
+        self._thread_local = threading.local()
+
+    def _login(self, driver):
+        """
+        使用保存的cookie登录Huggingface，通过一次CDP调用在首次访问页面前写入所有cookie
+        :param driver:  浏览器驱动
+        :return:        None
+        """
+        with open(self.logging_cookie_file_path, "rb") as file:
+            cookies = pickle.load(file)
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setCookies', {'cookies': [self._to_cdp_cookie(cookie) for cookie in cookies]})
+
+    @staticmethod
+    def _to_cdp_cookie(cookie):
+        """
+        将Selenium保存的cookie转换为CDP Network.setCookies所需的格式
+        :param cookie:  Selenium get_cookies()返回的单个cookie
+        :return:        CDP CookieParam
+        """
+        cdp_cookie = {
+            'name': cookie['name'],
+            'value': cookie['value'],
+            'domain': cookie.get('domain', 'huggingface.co'),
+            'path': cookie.get('path', '/'),
+            'secure': cookie.get('secure', False),
+            'httpOnly': cookie.get('httpOnly', False),
+        }
+        if 'expiry' in cookie:
+            cdp_cookie['expires'] = cookie['expiry']
+        if cookie.get('sameSite') in ('Strict', 'Lax', 'None'):
+            cdp_cookie['sameSite'] = cookie['sameSite']
+        return cdp_cookie
+
+    def _scrape_one(self, driver, link):
+        """
+        使用Selenium爬取需要填写表单的数据集页面
+        :param driver:              浏览器驱动
+        :param link:                数据集链接
+        :return:                    (组织名称, 数据集名称, 详细信息, 异常)
         """
+        organization, dataset_name = link.rsplit('/', 2)[-2:]
         try:
-            # 获取下载量
-            download_count_last_month = self.driver.find_element(By.XPATH, self.download_count_xpath).text
-            # 获取community社交活跃量——/html/body/div/main/div[1]/header/div/div[2]/div/的最后一个a
-            community = self.driver.find_element(By.XPATH, self.community_xpath).text
-            # 获取like数量
-            like = self.driver.find_element(By.XPATH, self.like_xpath).text
-            # 获取当前链接下所有tags信息
-            dataset_tags_info_divs = self.driver.find_elements(By.XPATH, self.tags_info_xpath)
-            dataset_tags_info_map = {}
-            # 每个div下的span为key,div中除了span的其余标签部分的文本作为value，同时获取arxiv链接
-            arxiv_id = ''
-            for div in dataset_tags_info_divs:
-                key = div.find_element(By.TAG_NAME, 'span').text.replace(':', '').replace("'", '').replace('"', '')
-                value = clean_text(div.text.replace(key, '').split(':')[-1]).replace("'", '').replace('"', '')
-                dataset_tags_info_map[key] = value
-                if key.lower() == 'arxiv':
-                    arxiv_id = clean_text(value.split(':')[-1])
-                    # arxiv_id: 2107.06499 + 4 对于这种多篇文章的arxiv_id，只取第一篇
-                    arxiv_id = arxiv_id.split(' ')[0]
-            # 获取数据集一些相关的信息
-            try:
-                data_info_div = self.driver.find_element(By.XPATH, self.data_info_div_xpath)
-                data_info = {}
-                if data_info_div:
-                    a_tags = data_info_div.find_elements(By.TAG_NAME, 'a')
-                    # 遍历a标签，获取每个a标签的第一个div作为key，第二个div作为value
-                    for a_tag in a_tags:
-                        divs = a_tag.find_elements(By.TAG_NAME, 'div')
-                        if len(divs) == 2:  # 确保每个a标签下有两个div
-                            key = divs[0].text.strip()  # 第一个div的文本作为key
-                            value = divs[1].text.strip()  # 第二个div的文本作为value
-                            data_info[key] = value
-
-                # 将获取到的数据量等信息保存到dataset_details中
-                dataset_details[organization][dataset_name]["dataset_info"] = data_info
-                logging.info(f"Get dataset info: {data_info}")
-            except Exception as e:
-                logging.info(f"Get dataset info failed: {e}")
-            # 获取数据集面板信息
-            if self.driver.find_elements(By.CSS_SELECTOR, "div[class='2xl\\:pr-6']"):
-                dataset_panel_info = self.driver.find_element(By.CSS_SELECTOR,
-                                                              "div[class='2xl\\:pr-6']").text.replace(
-                    '"',
-                    '').replace(
-                    "'", '')
-                dataset_details[organization][dataset_name]['dataset_panel_info'] = dataset_panel_info
-            # 获取数据集右侧 Collection 与相关 Model 信息
-            self._crawl_related_models_or_collections(self.driver, dataset_details, dataset_name, organization)
-            dataset_details[organization][dataset_name]['dataset_tags_info'] = dataset_tags_info_map
-            dataset_details[organization][dataset_name]["download_count_last_month"] = download_count_last_month
-            dataset_details[organization][dataset_name]['community'] = clean_text(
-                community.replace('Community', '')) if clean_text(community.replace('Community', '')) else '0'
-            dataset_details[organization][dataset_name]['like'] = clean_text(
-                like.replace('Like', '')) if clean_text(
-                like.replace('Like', '')) else '0'
+            driver.get(link)
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.DOWNLOAD_SEL)))
+
+            logging.info(f"Start crawling dataset: {link}")
+            # 如果查看数据集具体行数信息需要填写相关信息
+            if driver.find_elements(By.CSS_SELECTOR, self.NEED_FINISH_FORM_SEL):
+                labels = driver.find_elements(By.CSS_SELECTOR, self.FORM_ITEMS_SEL)
+                for label in labels:
+                    label.find_element(By.TAG_NAME, 'input').send_keys('asd')
+                driver.find_element(By.CSS_SELECTOR, self.FINISH_FORM_BUTTON_SEL).click()
+                # 等待表单提交完成
+                WebDriverWait(driver, 10).until(
+                    EC.invisibility_of_element_located((By.CSS_SELECTOR, self.NEED_FINISH_FORM_SEL)))
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, self.DOWNLOAD_SEL)))
+
+            details = {}
+            # 对当前页面进行截图，写盘在后台进行，与后续的数据提取重叠
+            png = driver.get_screenshot_as_png()
+            screenshot_path = f'{self.screen_shot_save_path}/{dataset_name}.png'
+            screenshot_future = self.io_pool.submit(self._write_file, screenshot_path, png)
+            # 存储部分信息并获得arxiv_id
+            arxiv_id = self._extract_related_data(driver, details)
+
+            details["link"] = link
+            details["paper_screenshot_save_path"] = self._save_paper_screenshot(arxiv_id, dataset_name)
+            # 只有截图成功写入后才记录其路径
+            details["dataset_screenshot_save_path"] = screenshot_path if screenshot_future.result() else ''
         except Exception as e:
-            raise e
+            return organization, dataset_name, None, e
+        return organization, dataset_name, details, None
+
+    def _save_paper_screenshot(self, arxiv_id, dataset_name):
+        """
+        对数据集相关的arxiv论文第一页进行截图
+        :param arxiv_id:            arxiv_id，为空时不截图
+        :param dataset_name:        数据集名称
+        :return:                    截图保存路径，没有arxiv_id或截图失败时为空字符串
+        """
+        if not arxiv_id:
+            return ''
+        arxiv_link = f'https://arxiv.org/pdf/{arxiv_id}'
+        save_path = f'{self.screen_shot_save_path}/{dataset_name}_pdf.png'
+        # 论文截图失败不影响数据集本身的信息
+        try:
+            with self._paper_semaphore:
+                response = self.http.get(arxiv_link, timeout=20)
+            response.raise_for_status()
+            # 直接渲染论文PDF的第一页，无需浏览器加载
+            with fitz.open(stream=response.content, filetype='pdf') as pdf:
+                png = pdf[0].get_pixmap(dpi=110).tobytes('png')
+        except Exception as e:
+            logging.info(f"Error: {e}, when taking screenshot of {arxiv_link}")
+            return ''
+        # 当前已在工作线程中，直接写盘，只有写入成功才返回路径
+        return save_path if self._write_file(save_path, png) else ''
+
+    @staticmethod
+    def _write_file(path, data):
+        """
+        将数据写入文件
+        :param path:    文件路径
+        :param data:    待写入的字节数据
+        :return:        是否写入成功
+        """
+        try:
+            with open(path, 'wb') as f:
+                f.write(data)
+        except Exception as e:
+            logging.error(f"Error: {e}, when writing {path}")
+            return False
+        return True
+
+    def _extract_related_data(self, driver, details):
+        """
+        提取相关数据，所有元素通过一次execute_script在页面内获取
+        :param driver:                  浏览器驱动
+        :param details:                 当前数据集详细信息，存储对象
+        :return:                        arxiv_id
+        """
+        data = orjson.loads(driver.execute_script(EXTRACT_DATASET_INFO_JS, {
+            'download_count': self.DOWNLOAD_SEL,
+            'community': self.COMMUNITY_SEL,
+            'like': self.LIKE_SEL,
+            'tags_info': self.TAGS_INFO_SEL,
+            'data_info_div': self.DATA_INFO_DIV_SEL,
+            'related_section': self.RELATED_SECTION_SEL,
+            'dataset_panel': self.DATASET_PANEL_SEL,
+        }))
+        for key in ('download_count', 'community', 'like'):
+            if data[key] is None:
+                raise ValueError(f"Element '{key}' not found in page")
+        # 获取下载量、community社交活跃量、like数量
+        download_count_last_month = clean_text(data['download_count'])
+        community = data['community']
+        like = data['like']
+        # 每个div下的span为key,div中除了span的其余标签部分的文本作为value，同时获取arxiv链接
+        dataset_tags_info_map = {}
+        arxiv_id = ''
+        for tag in data['tags']:
+            key = tag['key'].translate(_KEY_TRANS)
+            value = clean_text(tag['value'].replace(key, '').split(':')[-1]).translate(_QUOTE_TRANS)
+            dataset_tags_info_map[key] = value
+            if key.lower() == 'arxiv':
+                arxiv_id = clean_text(value.split(':')[-1])
+                # arxiv_id: 2107.06499 + 4 对于这种多篇文章的arxiv_id，只取第一篇
+                arxiv_id = arxiv_id.split(' ')[0]
+        # 获取数据集一些相关的信息，每个a标签的第一个div作为key，第二个div作为value
+        if data['data_info'] is not None:
+            data_info = {key.strip(): value.strip() for key, value in data['data_info']}
+            # 将获取到的数据量等信息保存到details中
+            details["dataset_info"] = data_info
+            logging.info(f"Get dataset info: {data_info}")
+        else:
+            logging.info("Get dataset info failed: data info div not found")
+        # 获取数据集面板信息
+        if data['panel_info'] is not None:
+            details['dataset_panel_info'] = data['panel_info'].translate(_QUOTE_TRANS)
+        # 获取数据集右侧 Collection 与相关 Model 信息
+        details['related_models_collections'] = \
+            self._crawl_related_models_or_collections(data['section_html']) if data['section_html'] else {}
+        details['dataset_tags_info'] = dataset_tags_info_map
+        details["download_count_last_month"] = download_count_last_month
+        community = clean_text(community.replace('Community', ''))
+        like = clean_text(like.replace('Like', ''))
+        details['community'] = community or '0'
+        details['like'] = like or '0'
 
         return arxiv_id
 
-    def _crawl_related_models_or_collections(self, driver, dataset_details, dataset_name, organization):
+    def _crawl_related_models_or_collections(self, section_html):
         """
         获取数据集右侧 Collection 与相关 Model 信息
-        :param driver:              浏览器驱动
-        :param dataset_details:     保留信息集合
-        :param dataset_name:        数据集名称
-        :param organization:        组织名称
-        :return:                    None
+        :param section_html:        右侧 section 元素的HTML
+        :return:                    {标题：{条目：{详细信息}}}
         """
         result = {}
         try:
-            # 找到指定的 section 元素
-            section_element = driver.find_element(By.XPATH, "/html/body/div/main/div[2]/section[2]")
-            section_html = section_element.get_attribute('outerHTML')
-            soup = BeautifulSoup(section_html, 'html.parser')
-            # 找到所有的h2标签
-            h2_tags = soup.find_all('h2')
-            # 遍历所有的h2标签
-            for i in range(len(h2_tags)):
-                current_h2 = h2_tags[i]
-                sub_title = clean_text(current_h2.text)
-                result[sub_title] = {}
-                # 如果还没到最后一个h2标签，获取当前h2到下一个h2之间的内容
-                if i + 1 < len(h2_tags):
-                    next_h2 = h2_tags[i + 1]
-                    contents = current_h2.find_next_siblings()  # 获取当前h2标签之后的所有兄弟元素
-                    for sibling in contents:
-                        if sibling == next_h2:
-                            break
-                        a_elements = sibling.find_all('a', href=True)
-                        self._extract_models_or_collections_items(a_elements, result, sub_title)
-                # 如果是最后一个h2标签，获取从当前h2到文档结束的所有内容
-                else:
-                    contents = current_h2.find_next_siblings()
-                    for sibling in contents:
-                        a_elements = sibling.find_all('a', href=True)
-                        self._extract_models_or_collections_items(a_elements, result, sub_title)
+            soup = BeautifulSoup(section_html, 'lxml')
+            first_h2 = soup.find('h2')
+            # 只遍历一次h2标签所在父元素的子元素，以h2标签为边界划分每个标题下的内容
+            sub_title = None
+            for element in first_h2.parent.children if first_h2 else []:
+                if element.name == 'h2':
+                    sub_title = clean_text(element.text)
+                    result[sub_title] = {}
+                elif element.name and sub_title is not None:
+                    a_elements = element.find_all('a', href=True)
+                    self._extract_models_or_collections_items(a_elements, result, sub_title)
         except Exception as e:
             print(f"获取相关 Model 或 Collection 信息失败：{e}")
-        dataset_details[organization][dataset_name]['related_models_collections'] = result
+        return result
 
     def _extract_models_or_collections_items(self, elements, result, sub_title):
         """
@@ -370,7 +696,7 @@ class HuggingfaceCrawler:
                 result[sub_title][header]['href'] = a_tag['href']
                 result[sub_title][header]['text'] = clean_text(a_tag.find('div').find('div').text)
             else:
-                result[sub_title][header]['other'] = clean_text(a_tag.text).replace('"', '').replace("'", '')
+                result[sub_title][header]['other'] = clean_text(a_tag.text).translate(_QUOTE_TRANS)
 
 
 if __name__ == '__main__':
@@ -379,4 +705,7 @@ if __name__ == '__main__':
                                              sort_method='downloads',
                                              save_dir='result/huggingface')
 
-    dataset_details, exception_links = huggingface_crawler.crawl_dataset_info()
+    try:
+        dataset_details, exception_links = huggingface_crawler.crawl_dataset_info()
+    finally:
+        huggingface_crawler.close()
@@ -2,6 +2,8 @@ import os
 import configparser
 from typing import Any, Optional, Union
 
+# 配置项不存在时的占位对象
+_MISSING = object()
 
 
 class ConfigReader:
@@ -16,6 +18,8 @@ class ConfigReader:
         self.config = configparser.ConfigParser()
         self.config_file = config_file
         self.env_prefix = env_prefix
+        # 每个实例各自缓存生成过的环境变量名
+        self._env_names = {}
         self.load_config()
 
     def load_config(self) -> None:
@@ -24,16 +28,27 @@ class ConfigReader:
             self.config.read(self.config_file, encoding='utf-8')
         except Exception as e:
             raise ConfigError(f"Failed to load config file: {e}")
+        # 预先展开为普通字典，读取时无需再经过configparser；插值失败的配置项单独记录，读取时再处理
+        self._sections = set(self.config.sections())
+        self._flat = {}
+        self._errors = {}
+        for section in self._sections:
+            for option in self.config.options(section):
+                try:
+                    self._flat[(section, option)] = self.config.get(section, option)
+                except configparser.InterpolationError as e:
+                    self._errors[(section, option)] = e
 
     def _get_env_name(self, section: str, option: str) -> str:
         """生成环境变量名"""
         if not self.env_prefix:
             return None
 
-        # 转换格式：如将 [database] user_name 转为 APP_DATABASE_USER_NAME
-        section_part = section.upper()
-        option_part = option.upper()
-        return f"{self.env_prefix}{section_part}_{option_part}"
+        key = (section, option)
+        if key not in self._env_names:
+            # 转换格式：如将 [database] user_name 转为 APP_DATABASE_USER_NAME
+            self._env_names[key] = f"{self.env_prefix}{section.upper()}_{option.upper()}"
+        return self._env_names[key]
 
     def get(self, section: str, option: str,
             default: Any = None, required: bool = False) -> Any:
@@ -47,69 +62,74 @@ class ConfigReader:
         """
         # 1. 首先尝试从环境变量获取
         env_name = self._get_env_name(section, option)
-        if env_name and env_name in os.environ:
-            return os.environ[env_name]
+        if env_name:
+            value = os.environ.get(env_name)
+            if value is not None:
+                return value
 
         # 2. 从配置文件获取
-        try:
-            if not self.config.has_section(section):
-                if required:
-                    raise ConfigError(f"Section '{section}' not found in config file")
-                return default
-
-            if not self.config.has_option(section, option):
-                if required:
-                    raise ConfigError(f"Option '{option}' not found in section '{section}'")
-                return default
-
-            return self.config.get(section, option)
-        except Exception as e:
-            if required:
-                raise ConfigError(f"Error reading config: {e}")
-            return default
-
-        def get_int(self, section: str, option: str,
-                    default: int = None, required: bool = False) -> int:
-            """获取整数型配置"""
-        value = self.get(section, option, default, required)
+        key = (section, self.config.optionxform(option))
+        value = self._flat.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if required:
+            if key in self._errors:
+                raise ConfigError(f"Error reading config: {self._errors[key]}")
+            if section not in self._sections:
+                raise ConfigError(f"Section '{section}' not found in config file")
+            raise ConfigError(f"Option '{option}' not found in section '{section}'")
+        return default
+
+    def _coerce(self, value: Any, caster, section: str, option: str,
+                type_name: str, default: Any, required: bool) -> Any:
+        """
+        将配置值转换为指定类型
+        :param value: 配置值
+        :param caster: 类型转换函数，转换失败时抛出 ValueError 或 TypeError
+        :param section: 配置节
+        :param option: 配置项
+        :param type_name: 类型名称（用于异常信息）
+        :param default: 转换失败时返回的默认值
+        :param required: 是否为必填项（为True时转换失败会抛出异常）
+        :return: 转换后的配置值
+        """
         if value is None:
             return None
         try:
-            return int(value)
-        except ValueError:
+            return caster(value)
+        except (ValueError, TypeError):
             if required:
-                raise ConfigError(f"Option '{option}' in section '{section}' must be an integer")
+                raise ConfigError(f"Option '{option}' in section '{section}' must be {type_name}")
             return default
 
+    def get_int(self, section: str, option: str,
+                default: int = None, required: bool = False) -> int:
+        """获取整数型配置"""
+        return self._coerce(self.get(section, option, default, required), int,
+                            section, option, 'an integer', default, required)
+
     def get_float(self, section: str, option: str,
                   default: float = None, required: bool = False) -> float:
         """获取浮点型配置"""
-        value = self.get(section, option, default, required)
-        if value is None:
-            return None
-        try:
-            return float(value)
-        except ValueError:
-            if required:
-                raise ConfigError(f"Option '{option}' in section '{section}' must be a float")
-            return default
+        return self._coerce(self.get(section, option, default, required), float,
+                            section, option, 'a float', default, required)
 
     def get_boolean(self, section: str, option: str,
                     default: bool = None, required: bool = False) -> bool:
         """获取布尔型配置"""
-        value = self.get(section, option, default, required)
-        if value is None:
-            return None
-        if isinstance(value, bool):
-            return value
-        if value.lower() in ('true', 'yes', '1'):
-            return True
-        elif value.lower() in ('false', 'no', '0'):
-            return False
-        else:
-            if required:
-                raise ConfigError(f"Option '{option}' in section '{section}' must be a boolean")
-            return default
+        return self._coerce(self.get(section, option, default, required), _to_bool,
+                            section, option, 'a boolean', default, required)
+
+
+def _to_bool(value: Any) -> bool:
+    """将配置值转换为布尔值"""
+    if isinstance(value, bool):
+        return value
+    if value.lower() in ('true', 'yes', '1'):
+        return True
+    if value.lower() in ('false', 'no', '0'):
+        return False
+    raise ValueError(f"Invalid boolean value: {value}")
 
 
 class ConfigError(Exception):
@@ -16,11 +16,17 @@ from webdriver_manager.chrome import ChromeDriverManager
 # 根据自己的代理地址和端口填写，也可以不设置注释掉
 os.environ['ALL_PROXY'] = 'http://127.0.0.1:7890'
 
+# 截图中不可见、但体积较大的音视频文件，通过CDP Network.setBlockedURLs按URL屏蔽
+BLOCKED_RESOURCE_URLS = ['*.mp4', '*.webm', '*.mov', '*.mp3', '*.wav', '*.ogg']
 
 
-def init_driver(headless=True,chrome_exe_path = None):
+def init_driver(headless=True,chrome_exe_path = None, block_resources=False, driver_path=None):
     """
     初始化WebDriver
+    :param headless:            是否启用无头模式
+    :param chrome_exe_path:     Chrome浏览器路径
+    :param block_resources:     是否通过CDP屏蔽BLOCKED_RESOURCE_URLS中的音视频文件(mp4/webm/mov/mp3/wav/ogg)，其他资源不受影响
+    :param driver_path:         已下载好的chromedriver路径，为None时使用webdriver-manager自动下载
     :return:    WebDriver
     """
     # 初始化WebDriver
@@ -33,8 +39,11 @@ def init_driver(headless=True,chrome_exe_path = None):
     if chrome_exe_path:
         options.binary_location = chrome_exe_path # 设置Chrome浏览器路径
     # 使用webdriver-manager自动下载并启动chrome驱动
-    service = Service(ChromeDriverManager().install())
+    service = Service(driver_path or ChromeDriverManager().install())
     driver = webdriver.Chrome(service = service, options=options)
+    if block_resources:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCE_URLS})
     return driver
 
 